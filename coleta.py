@@ -0,0 +1,184 @@
+"""
+Módulo de Coletas Retomáveis.
+
+Uma coleta é dividida em unidades de trabalho (provedor × período/dia) que são
+registradas em um manifesto salvo em disco (`<DIRETORIO_COLETAS>/<job_id>/manifesto.json`).
+O resultado de cada unidade concluída é gravado em um arquivo próprio assim que
+ela termina. Se a execução for interrompida (erro de conexão, processo encerrado,
+etc.), rodar novamente a mesma coleta executa apenas as unidades pendentes e
+reaproveita as que já foram concluídas, sem repetir chamadas às APIs.
+
+Os provedores retornam None quando a consulta falha (erro de conexão, limite
+excedido, etc.) e um resultado vazio quando simplesmente não há dados no período.
+Só as falhas deixam a unidade pendente para a próxima execução; um resultado vazio
+também conclui a unidade, para não repetir chamadas inúteis.
+
+Falhas que não se resolvem tentando de novo (chave não configurada, acesso negado)
+são sinalizadas com ErroPermanente: todas as unidades ainda pendentes do provedor
+passam para o estado 'erro_permanente' e não são mais consultadas. O mesmo acontece
+com uma unidade que falhou MAXIMO_TENTATIVAS vezes. Para tentar de novo depois de
+corrigir a configuração, apague o diretório da coleta.
+"""
+import json
+import os
+import re
+from datetime import datetime, timedelta
+
+import config
+from provedores.decodificacao import carregar_json, mesclar_colunas
+from provedores.erros import ErroPermanente
+
+NOME_MANIFESTO = "manifesto.json"
+
+# Número de falhas seguidas após o qual uma unidade deixa de ser tentada
+MAXIMO_TENTATIVAS = 5
+
+
+def gerar_job_id(local, data_inicio, data_fim):
+    """Gera um identificador de coleta a partir do local e do período."""
+    local_slug = re.sub(r'[^0-9A-Za-z]+', '_', local).strip('_')
+    return f"{local_slug}_{data_inicio.strftime('%Y%m%d')}_{data_fim.strftime('%Y%m%d')}"
+
+
+def dividir_periodo(data_inicio, data_fim, dias):
+    """Divide o intervalo [data_inicio, data_fim) em blocos consecutivos de até `dias` dias."""
+    blocos = []
+    inicio = data_inicio
+    while inicio < data_fim:
+        fim = min(inicio + timedelta(days=dias), data_fim)
+        blocos.append((inicio, fim))
+        inicio = fim
+    return blocos
+
+
+def _diretorio_coleta(job_id):
+    return os.path.join(config.DIRETORIO_COLETAS, job_id)
+
+
+def _gravar_json(caminho, conteudo):
+    """Grava um arquivo JSON de forma atômica (arquivo temporário + rename)."""
+    caminho_tmp = f"{caminho}.tmp"
+    with open(caminho_tmp, 'w', encoding='utf-8') as arquivo:
+        json.dump(conteudo, arquivo, ensure_ascii=False)
+    os.replace(caminho_tmp, caminho)
+
+
+def _ler_json(caminho):
+    with open(caminho, 'rb') as arquivo:
+        return carregar_json(arquivo.read())
+
+
+def abrir_coleta(job_id):
+    """
+    Abre o manifesto de uma coleta, criando-o se ainda não existir.
+
+    Args:
+        job_id (str): Identificador da coleta.
+
+    Returns:
+        dict: O manifesto, com as chaves 'job_id' e 'unidades'.
+    """
+    diretorio = _diretorio_coleta(job_id)
+    caminho = os.path.join(diretorio, NOME_MANIFESTO)
+    if os.path.exists(caminho):
+        manifesto = _ler_json(caminho)
+        pendentes = sum(1 for u in manifesto['unidades'].values() if u['estado'] == 'pendente')
+        print(f"Retomando a coleta '{job_id}' ({pendentes} de {len(manifesto['unidades'])} unidades pendentes).")
+        return manifesto
+
+    os.makedirs(diretorio, exist_ok=True)
+    manifesto = {'job_id': job_id, 'criado_em': datetime.now().isoformat(timespec='seconds'), 'unidades': {}}
+    _gravar_json(caminho, manifesto)
+    print(f"Nova coleta '{job_id}' criada em {diretorio}.")
+    return manifesto
+
+
+def salvar_manifesto(manifesto):
+    """Persiste o manifesto no diretório da coleta."""
+    caminho = os.path.join(_diretorio_coleta(manifesto['job_id']), NOME_MANIFESTO)
+    _gravar_json(caminho, manifesto)
+
+
+def registrar_unidades(manifesto, unidades):
+    """
+    Registra no manifesto as unidades planejadas que ainda não estão nele.
+
+    Args:
+        manifesto (dict): O manifesto da coleta.
+        unidades (list): Pares (provedor, unidade_id).
+    """
+    for provedor, unidade_id in unidades:
+        chave = f"{provedor}__{unidade_id}"
+        manifesto['unidades'].setdefault(chave, {
+            'provedor': provedor,
+            'unidade': unidade_id,
+            'estado': 'pendente',
+            'tentativas': 0,
+            'arquivo': None,
+            'motivo': None,
+        })
+    salvar_manifesto(manifesto)
+
+
+def executar_unidade(manifesto, provedor, unidade_id, funcao, *args):
+    """
+    Executa uma unidade de trabalho, ou reaproveita seu resultado se já estiver concluída.
+
+    Args:
+        manifesto (dict): O manifesto da coleta.
+        provedor (str): Nome do provedor (ex: 'OpenWeatherMap').
+        unidade_id (str): Identificador da unidade dentro do provedor (ex: '20240720').
+        funcao (callable): Função do provedor que busca os dados.
+        *args: Argumentos repassados para `funcao`.
+
+    Returns:
+        Os dados retornados pelo provedor (ou lidos do disco), ou None se a consulta falhou
+        ou se a unidade está em 'erro_permanente'.
+    """
+    chave = f"{provedor}__{unidade_id}"
+    unidade = manifesto['unidades'][chave]
+    diretorio = _diretorio_coleta(manifesto['job_id'])
+
+    if unidade['estado'] == 'concluida':
+        print(f"--- {provedor} ({unidade_id}): já concluído, reaproveitando dados salvos ---")
+        return _ler_json(os.path.join(diretorio, unidade['arquivo']))
+    if unidade['estado'] == 'erro_permanente':
+        print(f"--- {provedor} ({unidade_id}): ignorado ({unidade.get('motivo')}) ---")
+        return None
+
+    unidade['tentativas'] += 1
+    try:
+        dados = funcao(*args)
+    except ErroPermanente as e:
+        print(f"  - {e} Pulando as demais consultas do {provedor}.")
+        # O erro vale para o provedor inteiro: não adianta consultar as outras unidades dele
+        for outra in manifesto['unidades'].values():
+            if outra['provedor'] == provedor and outra['estado'] == 'pendente':
+                outra['estado'] = 'erro_permanente'
+                outra['motivo'] = str(e)
+        salvar_manifesto(manifesto)
+        return None
+
+    if dados is not None:
+        unidade['arquivo'] = f"{chave}.json"
+        _gravar_json(os.path.join(diretorio, unidade['arquivo']), dados)
+        unidade['estado'] = 'concluida'
+    elif unidade['tentativas'] >= MAXIMO_TENTATIVAS:
+        unidade['estado'] = 'erro_permanente'
+        unidade['motivo'] = f"falhou {unidade['tentativas']} vezes"
+    salvar_manifesto(manifesto)
+    return dados
+
+
+def mesclar_dados(acumulado, dados):
+    """Junta os dados de uma unidade aos já acumulados para o mesmo provedor."""
+    if not dados:
+        return acumulado if acumulado is not None else dados
+    if not acumulado:
+        return dados
+    if isinstance(dados, dict):
+        # Colunas (dicionário de listas)
+        mesclar_colunas(acumulado, dados)
+    else:
+        acumulado.extend(dados)
+    return acumulado
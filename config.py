@@ -25,3 +25,9 @@ WOLFRAM_API_KEY = os.getenv("WOLFRAM_API_KEY")
 # Coordenadas padrão (usadas como fallback caso a geocodificação falhe)
 LATITUDE = os.getenv("LATITUDE", "-24.73")
 LONGITUDE = os.getenv("LONGITUDE", "-53.74")
+
+# Diretório onde ficam os manifestos e resultados parciais das coletas retomáveis
+DIRETORIO_COLETAS = os.getenv("DIRETORIO_COLETAS", "coletas")
+
+# Preenche lacunas de um provedor com o provedor mais concordante no controle de qualidade
+PREENCHER_LACUNAS = os.getenv("PREENCHER_LACUNAS", "false").lower() in ("1", "true", "sim")
@@ -3,6 +3,12 @@ import pandas as pd
 from datetime import datetime, timedelta
 from geopy.geocoders import Nominatim
 
+from normalizacao import coluna_data_hora, normalizar_data_hora
+from qualidade import converter_variaveis_numericas, aplicar_controle_qualidade
+from coleta import (
+    gerar_job_id, dividir_periodo, abrir_coleta, registrar_unidades, executar_unidade, mesclar_dados
+)
+
 # Importa as funções dos provedores
 from provedores.portal_inmet import obter_dados_portal_inmet # ATUALIZADO
 from provedores.openweathermap import obter_dados_openweathermap
@@ -57,18 +63,25 @@ def salvar_dados_consolidados(dados_por_provedor, local):
         if not dados:
             continue
         
+        # Os provedores entregam colunas (dicionário de listas) ou uma lista de dicionários;
+        # o DataFrame aceita os dois formatos diretamente.
         df = pd.DataFrame(dados)
         # Identifica a coluna de data/hora, que pode ter nomes diferentes
-        date_col = 'data_hora' if 'data_hora' in df.columns else 'data_consulta'
-        if date_col not in df.columns:
+        date_col = coluna_data_hora(provedor, df.columns)
+        if date_col is None:
             continue
 
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-        # PADRONIZA PARA 'NAIVE': Remove informações de fuso horário (timezone)
-        # para evitar erros ao juntar DataFrames de APIs com e sem essa informação.
-        df[date_col] = df[date_col].dt.tz_localize(None)
-        df = df.dropna(subset=[date_col])
-        df = df.set_index(date_col)
+        # PADRONIZA PARA UTC: cada provedor é lido com seu formato e fuso declarados,
+        # para que as mesmas horas de provedores diferentes fiquem alinhadas.
+        df.index = normalizar_data_hora(df.pop(date_col), provedor)
+        df = df[df.index.notna()]
+
+        # Só as colunas numéricas entram na média horária; textos como o nome da estação ou as
+        # respostas do WolframAlpha ficam de fora. Um provedor sem nenhuma coluna numérica é
+        # ignorado, para que suas datas não estiquem o período do CSV.
+        df = converter_variaveis_numericas(df).select_dtypes(include='number')
+        if df.columns.empty:
+            continue
 
         # Renomeia todas as colunas de dados com o sufixo do provedor
         colunas_renomear = {col: f"{col}_{provedor.replace(' ', '')}" for col in df.columns if col not in ['provedor']}
@@ -85,12 +98,17 @@ def salvar_dados_consolidados(dados_por_provedor, local):
         return
 
     # Concatena todos os DataFrames
-    df_final = pd.concat(lista_dfs, axis=1)
+    # (ordenados por data/hora: a reamostragem e a verificação de saltos dependem disso)
+    df_final = pd.concat(lista_dfs, axis=1, sort=True)
     
     # Reamostra para frequência horária, calculando a média
     # Isso garante que todos os dados estejam alinhados de hora em hora.
 
-    df_final = df_final.resample('h').mean().round(2)
+    df_final = df_final.resample('h').mean()
+
+    # Controle de qualidade sobre a matriz hora × provedor de cada variável
+    df_final = aplicar_controle_qualidade(df_final, preencher_lacunas=config.PREENCHER_LACUNAS)
+    df_final = df_final.round(2)
     df_final.reset_index(inplace=True)
 
     nome_arquivo = f"dados_climaticos_{local.replace(', ', '_').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
@@ -98,6 +116,41 @@ def salvar_dados_consolidados(dados_por_provedor, local):
     df_final.to_csv(nome_arquivo, index=False, encoding='utf-8-sig')
     print(f"\nDados consolidados e formatados salvos com sucesso em: {nome_arquivo}")
 
+def planejar_unidades(local_nome, data_inicio, data_fim, latitude, longitude):
+    """
+    Divide a coleta em unidades de trabalho independentes.
+
+    Returns:
+        list: Tuplas (provedor, unidade_id, funcao, argumentos).
+    """
+    unidades = []
+
+    # O Portal INMET escolhe a estação mais próxima com dados, então o período inteiro é uma unidade
+    unidades.append(('PortalINMET', 'periodo', obter_dados_portal_inmet,
+                     (data_inicio, data_fim, latitude, longitude)))
+
+    # O OpenWeatherMap já consulta em janelas de 7 dias
+    for inicio, fim in dividir_periodo(data_inicio, data_fim, 7):
+        unidades.append(('OpenWeatherMap', inicio.strftime('%Y%m%d'), obter_dados_openweathermap,
+                         (config.OPENWEATHERMAP_API_KEY, inicio, fim, latitude, longitude)))
+
+    # O StormGlass tem limite de 10 chamadas/dia, então o período inteiro é uma única chamada
+    unidades.append(('StormGlass', 'periodo', obter_dados_stormglass,
+                     (config.STORMGLASS_API_KEY, data_inicio, data_fim, latitude, longitude)))
+
+    # O Visual Crossing é consultado em blocos de 30 dias. Sua data final é inclusiva,
+    # então cada bloco termina no dia anterior ao início do próximo (evita horas duplicadas).
+    for inicio, fim in dividir_periodo(data_inicio, data_fim, 30):
+        unidades.append(('VisualCrossing', inicio.strftime('%Y%m%d'), obter_dados_visualcrossing,
+                         (config.VISUALCROSSING_API_KEY, inicio, fim - timedelta(days=1), local_nome)))
+
+    # O WolframAlpha é consultado dia a dia
+    for inicio, _ in dividir_periodo(data_inicio, data_fim, 1):
+        unidades.append(('WolframAlpha', inicio.strftime('%Y%m%d'), obter_dados_wolfram,
+                         (config.WOLFRAM_API_KEY, inicio, local_nome)))
+
+    return unidades
+
 def main():
     """Função principal para orquestrar a coleta de dados."""
     local_nome, data_inicio, data_fim = obter_entradas_usuario()
@@ -105,21 +158,26 @@ def main():
     
     print(f"\nIniciando coleta de dados para '{local_nome}' de {data_inicio.strftime('%d/%m/%Y')} a {(data_fim - timedelta(days=1)).strftime('%d/%m/%Y')}...\n")
 
+    # Abre (ou retoma) o manifesto da coleta; rodar de novo com a mesma entrada executa só o que faltou
+    manifesto = abrir_coleta(gerar_job_id(local_nome, data_inicio, data_fim))
+    unidades = planejar_unidades(local_nome, data_inicio, data_fim, latitude, longitude)
+    registrar_unidades(manifesto, [(provedor, unidade_id) for provedor, unidade_id, _, _ in unidades])
+
     dados_coletados = {}
 
-    # Executa cada provedor e armazena os dados em um dicionário
-    dados_coletados['PortalINMET'] = obter_dados_portal_inmet(data_inicio, data_fim, latitude, longitude)
-    dados_coletados['OpenWeatherMap'] = obter_dados_openweathermap(config.OPENWEATHERMAP_API_KEY, data_inicio, data_fim, latitude, longitude)
-    dados_coletados['StormGlass'] = obter_dados_stormglass(config.STORMGLASS_API_KEY, data_inicio, data_fim, latitude, longitude)
-    dados_coletados['VisualCrossing'] = obter_dados_visualcrossing(config.VISUALCROSSING_API_KEY, data_inicio, data_fim, local_nome)
-    
-    # O WolframAlpha é consultado dia a dia
-    dados_wolfram = []
-    dias_no_intervalo = (data_fim - data_inicio).days
-    for i in range(dias_no_intervalo):
-        data_consulta = data_inicio + timedelta(days=i)
-        dados_wolfram.extend(obter_dados_wolfram(config.WOLFRAM_API_KEY, data_consulta, local_nome))
-    dados_coletados['WolframAlpha'] = dados_wolfram
+    # Executa cada unidade e acumula os dados por provedor
+    for provedor, unidade_id, funcao, argumentos in unidades:
+        dados = executar_unidade(manifesto, provedor, unidade_id, funcao, *argumentos)
+        dados_coletados[provedor] = mesclar_dados(dados_coletados.get(provedor), dados)
+
+    pendentes = [u for u in manifesto['unidades'].values() if u['estado'] == 'pendente']
+    if pendentes:
+        print(f"\n{len(pendentes)} unidades falharam; rode novamente com a mesma entrada para tentar só essas.")
+    ignoradas = [u for u in manifesto['unidades'].values() if u['estado'] == 'erro_permanente']
+    if ignoradas:
+        provedores = sorted({u['provedor'] for u in ignoradas})
+        print(f"{len(ignoradas)} unidades não serão tentadas de novo ({', '.join(provedores)}): "
+              "verifique as chaves de API e o plano contratado, e apague o diretório da coleta para refazê-las.")
 
     salvar_dados_consolidados(dados_coletados, local_nome)
 
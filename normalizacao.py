@@ -0,0 +1,78 @@
+"""
+Módulo de Normalização de Data/Hora.
+
+Cada provedor entrega a data/hora em um formato e fuso horário diferentes. Em vez
+de deixar o pandas adivinhar o formato linha a linha, este módulo declara o
+formato exato de cada fonte e converte tudo, de forma vetorizada, para um índice
+em UTC (datetime64[ns, UTC], armazenado internamente como int64). Assim as horas
+de provedores diferentes ficam corretamente alinhadas na consolidação.
+"""
+import pandas as pd
+
+# Formato de data/hora de cada provedor:
+# - 'coluna': nome da coluna com a data/hora nos registros do provedor.
+# - 'formato': formato do strptime, ou 'unix' para segundos desde a época (UTC).
+# - 'fuso': fuso horário dos valores sem deslocamento explícito (ignorado para 'unix'
+#   e para formatos com %z, que já trazem o deslocamento).
+FORMATOS_DATA_HORA = {
+    # DT_MEDICAO + HR_MEDICAO, ex: "2024-07-20 1300" (o INMET publica em UTC)
+    'PortalINMET': {'coluna': 'data_hora', 'formato': '%Y-%m-%d %H%M', 'fuso': 'UTC'},
+    'INMET': {'coluna': 'data_hora', 'formato': '%Y-%m-%d %H%M', 'fuso': 'UTC'},
+    # Campo 'dt' da API
+    'OpenWeatherMap': {'coluna': 'data_hora', 'formato': 'unix'},
+    # Ex: "2024-07-20T13:00:00+00:00"
+    'StormGlass': {'coluna': 'data_hora', 'formato': '%Y-%m-%dT%H:%M:%S%z'},
+    # Campo 'datetimeEpoch' de cada hora
+    'VisualCrossing': {'coluna': 'data_hora', 'formato': 'unix'},
+    # Apenas a data consultada, no horário local
+    'WolframAlpha': {'coluna': 'data_consulta', 'formato': '%Y-%m-%d', 'fuso': 'America/Sao_Paulo'},
+}
+
+NOME_INDICE = 'data_hora_utc'
+
+
+def coluna_data_hora(provedor, colunas):
+    """Retorna o nome da coluna de data/hora de um provedor, ou None se ela não existir."""
+    formato = FORMATOS_DATA_HORA.get(provedor)
+    if formato is not None:
+        return formato['coluna'] if formato['coluna'] in colunas else None
+    # Provedor sem formato declarado: usa o nome de coluna convencional
+    for coluna in ('data_hora', 'data_consulta'):
+        if coluna in colunas:
+            return coluna
+    return None
+
+
+def normalizar_data_hora(valores, provedor):
+    """
+    Converte os valores de data/hora de um provedor para um índice em UTC.
+
+    Args:
+        valores (pd.Series): Valores de data/hora no formato nativo do provedor.
+        provedor (str): Nome do provedor (chave de FORMATOS_DATA_HORA).
+
+    Returns:
+        pd.DatetimeIndex: Índice em UTC; valores inválidos viram NaT.
+    """
+    formato = FORMATOS_DATA_HORA.get(provedor)
+
+    if formato is None:
+        # Sem formato declarado: recorre à inferência (mais lenta), tratando tudo como UTC
+        datas = pd.to_datetime(valores, errors='coerce', utc=True)
+    elif formato['formato'] == 'unix':
+        segundos = pd.to_numeric(valores, errors='coerce')
+        # Avisa sobre valores que não são timestamps, em vez de descartá-los em silêncio
+        invalidos = segundos.isna() & pd.notna(valores)
+        if invalidos.any():
+            exemplo = valores[invalidos].iloc[0]
+            print(f"  - Aviso: {provedor}: {int(invalidos.sum())} valores de data/hora não são "
+                  f"timestamps Unix (ex: {exemplo!r}) e foram descartados.")
+        datas = pd.to_datetime(segundos, unit='s', utc=True)
+    elif '%z' in formato['formato']:
+        datas = pd.to_datetime(valores, format=formato['formato'], errors='coerce', utc=True)
+    else:
+        datas = pd.to_datetime(valores, format=formato['formato'], errors='coerce')
+        datas = datas.dt.tz_localize(formato['fuso'], ambiguous='NaT', nonexistent='NaT').dt.tz_convert('UTC')
+
+    # Unifica a resolução em nanossegundos (int64) para todos os provedores
+    return pd.DatetimeIndex(datas, name=NOME_INDICE).astype('datetime64[ns, UTC]')
@@ -0,0 +1,122 @@
+"""
+Módulo de Decodificação JSON.
+
+Centraliza a leitura das respostas JSON dos provedores para evitar que o corpo
+bruto, a árvore de objetos decodificada e a lista de registros fiquem todos em
+memória ao mesmo tempo.
+
+- Se a biblioteca `ijson` estiver instalada, os registros são lidos de forma
+  incremental, direto do fluxo da resposta HTTP.
+- Caso contrário, o buffer bruto é decodificado de uma vez com o `orjson`
+  (bem mais rápido que o `json` padrão) ou, na falta dele, com o `json`.
+
+Os registros lidos são acumulados em colunas (um dicionário de listas), formato
+que o `pd.DataFrame` aceita diretamente e que ocupa bem menos memória do que
+uma lista de dicionários.
+"""
+import json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Exceções que indicam uma resposta JSON inválida ou incompleta.
+# (json.JSONDecodeError e orjson.JSONDecodeError são subclasses de ValueError)
+ERROS_JSON = (ValueError, ijson.JSONError) if ijson is not None else (ValueError,)
+
+
+def carregar_json(dados_brutos):
+    """Decodifica um documento JSON completo a partir de bytes ou str."""
+    if orjson is not None:
+        return orjson.loads(dados_brutos)
+    return json.loads(dados_brutos)
+
+
+def _navegar(objeto, partes):
+    """Percorre um objeto já decodificado seguindo um caminho no estilo do ijson."""
+    if not partes:
+        yield objeto
+        return
+
+    chave, resto = partes[0], partes[1:]
+    if chave == 'item':
+        if isinstance(objeto, list):
+            for elemento in objeto:
+                yield from _navegar(elemento, resto)
+    elif isinstance(objeto, dict) and chave in objeto:
+        yield from _navegar(objeto[chave], resto)
+
+
+def iterar_itens(fluxo, caminho=''):
+    """
+    Gera os objetos encontrados em `caminho` dentro de um documento JSON.
+
+    Args:
+        fluxo: Objeto com método `read()` (ex: resposta do urllib ou `fluxo_requests(response)` do requests).
+        caminho (str): Caminho no formato do ijson (ex: 'days.item' para cada
+            elemento da lista 'days'; 'item' para cada elemento da lista raiz).
+
+    Yields:
+        Cada objeto encontrado no caminho, na ordem do documento.
+    """
+    if ijson is not None:
+        yield from ijson.items(fluxo, caminho, use_float=True)
+        return
+
+    partes = caminho.split('.') if caminho else []
+    yield from _navegar(carregar_json(fluxo.read()), partes)
+
+
+class _FluxoResposta:
+    """
+    Adapta uma resposta do `requests` (feita com stream=True) para a interface de arquivo (`read`).
+
+    A leitura passa pelo `iter_content`, que descompacta o corpo (gzip/deflate) e converte as
+    falhas de leitura do urllib3 (timeout, conexão interrompida) em `requests.exceptions.RequestException`.
+    """
+
+    def __init__(self, response, tamanho_bloco=64 * 1024):
+        self._blocos = response.iter_content(chunk_size=tamanho_bloco)
+        self._pendente = b''
+
+    def read(self, tamanho=-1):
+        if tamanho is None or tamanho < 0:
+            restante = self._pendente + b''.join(self._blocos)
+            self._pendente = b''
+            return restante
+
+        while not self._pendente:
+            self._pendente = next(self._blocos, None)
+            if self._pendente is None:
+                self._pendente = b''
+                return b''
+        bloco, self._pendente = self._pendente[:tamanho], self._pendente[tamanho:]
+        return bloco
+
+
+def fluxo_requests(response):
+    """Prepara uma resposta do `requests` (feita com stream=True) para leitura incremental."""
+    return _FluxoResposta(response)
+
+
+def acumular_registro(colunas, registro):
+    """Anexa os valores de um registro (dicionário) às listas de colunas correspondentes."""
+    for chave, valor in registro.items():
+        colunas.setdefault(chave, []).append(valor)
+
+
+def mesclar_colunas(destino, colunas):
+    """Anexa as colunas de um bloco de registros às colunas de destino."""
+    for chave, valores in colunas.items():
+        destino.setdefault(chave, []).extend(valores)
+
+
+def contar_registros(colunas):
+    """Retorna o número de registros acumulados em um dicionário de colunas."""
+    return len(next(iter(colunas.values()), []))
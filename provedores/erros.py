@@ -0,0 +1,10 @@
+"""
+Erros compartilhados pelos provedores.
+"""
+
+
+class ErroPermanente(Exception):
+    """
+    Falha que não se resolve tentando de novo (chave de API não configurada, acesso
+    negado pelo plano contratado, etc.). Vale para todas as consultas do provedor.
+    """
@@ -1,8 +1,11 @@
 import requests
-import json
 from datetime import datetime
 from geopy.distance import geodesic
 
+from provedores.decodificacao import (
+    ERROS_JSON, iterar_itens, fluxo_requests, acumular_registro, mesclar_colunas, contar_registros
+)
+
 def obter_dados_inmet(data_inicio, data_fim, latitude, longitude):
     """
     Busca dados de estações meteorológicas do INMET próximas a uma coordenada para um período.
@@ -14,73 +17,81 @@ def obter_dados_inmet(data_inicio, data_fim, latitude, longitude):
         longitude (float): Longitude do local.
 
     Returns:
-        list: Uma lista de dicionários com os dados coletados.
+        dict: Colunas (dicionário de listas) com os dados coletados, ou
+            None em caso de falha (a consulta deve ser repetida).
     """
     print("--- Executando INMET ---")
+    coordenadas_local = (latitude, longitude)
+    estacoes_proximas = []
     try:
         # 1. Obter a lista de todas as estações automáticas
         url_estacoes = "https://apitempo.inmet.gov.br/estacoes/T"
-        response = requests.get(url_estacoes)
-        response.raise_for_status()  # Lança exceção para erros HTTP
-        estacoes = response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Erro ao buscar estações do INMET: {e}")
-        return []
-    except json.JSONDecodeError:
-        print("Erro ao decodificar a resposta JSON das estações do INMET.")
-        return []
+        with requests.get(url_estacoes, stream=True) as response:
+            response.raise_for_status()  # Lança exceção para erros HTTP
 
-    # 2. Filtrar estações próximas
-    coordenadas_local = (latitude, longitude)
-    estacoes_proximas = []
-    for estacao in estacoes:
-        try:
-            lat_estacao = float(estacao['VL_LATITUDE'])
-            lon_estacao = float(estacao['VL_LONGITUDE'])
-            estacao_coords = (lat_estacao, lon_estacao)
+            # 2. Filtrar estações próximas à medida que são lidas, sem guardar o catálogo inteiro
+            for estacao in iterar_itens(fluxo_requests(response), 'item'):
+                try:
+                    lat_estacao = float(estacao['VL_LATITUDE'])
+                    lon_estacao = float(estacao['VL_LONGITUDE'])
+                    estacao_coords = (lat_estacao, lon_estacao)
 
-            distancia_km = geodesic(coordenadas_local, estacao_coords).km
+                    distancia_km = geodesic(coordenadas_local, estacao_coords).km
 
-            if distancia_km < 100:  # Aumentei o raio para 100 km para garantir mais resultados
-                estacoes_proximas.append(estacao)
-        except (ValueError, TypeError, KeyError):
-            continue
+                    if distancia_km < 100:  # Aumentei o raio para 100 km para garantir mais resultados
+                        estacoes_proximas.append(estacao)
+                except (ValueError, TypeError, KeyError):
+                    continue
+    except requests.exceptions.RequestException as e:
+        print(f"Erro ao buscar estações do INMET: {e}")
+        return None
+    except ERROS_JSON:
+        print("Erro ao decodificar a resposta JSON das estações do INMET.")
+        return None
 
     if not estacoes_proximas:
         print("Nenhuma estação do INMET encontrada em um raio de 100 km.")
-        return []
+        return {}
 
     # 3. Buscar e retornar dados das estações próximas
-    dados_coletados = []
+    dados_coletados = {}
+    houve_falha = False
     for estacao in estacoes_proximas:
         codigo_estacao = estacao['CD_ESTACAO']
         url_dados = f"https://apitempo.inmet.gov.br/estacao/{data_inicio.strftime('%Y-%m-%d')}/{data_fim.strftime('%Y-%m-%d')}/{codigo_estacao}"
 
         try:
-            response_dados = requests.get(url_dados)
-            if response_dados.status_code == 200:
-                dados = response_dados.json()
-                if dados:
-                    print(f"  - Estação {codigo_estacao} ({estacao.get('DC_NOME', 'N/A')}) tem dados.")
-                    for item in dados:
-                        dados_coletados.append({
-                            'provedor': 'INMET',
-                            'estacao_codigo': codigo_estacao,
-                            'estacao_nome': estacao.get('DC_NOME', 'N/A'),
-                            'data_hora': f"{item.get('DT_MEDICAO')} {item.get('HR_MEDICAO')}",
-                            'temperatura_c': item.get('TEMP_INS'),
-                            'umidade_relativa': item.get('UMID_INS'),
-                            'pressao_hpa': item.get('PRES_INS'),
-                            'velocidade_vento_ms': item.get('VETO_VEL'),
-                        })
-            else:
-                # Silencioso para não poluir a saída com estações sem dados
-                pass
-        except (requests.exceptions.RequestException, json.JSONDecodeError):
+            with requests.get(url_dados, stream=True) as response_dados:
+                if response_dados.status_code != 200:
+                    # Silencioso para não poluir a saída com estações sem dados
+                    continue
+
+                # Os registros de cada estação só entram no resultado se a leitura terminar sem erros
+                dados_estacao = {}
+                for item in iterar_itens(fluxo_requests(response_dados), 'item'):
+                    acumular_registro(dados_estacao, {
+                        'provedor': 'INMET',
+                        'estacao_codigo': codigo_estacao,
+                        'estacao_nome': estacao.get('DC_NOME', 'N/A'),
+                        'data_hora': f"{item.get('DT_MEDICAO')} {item.get('HR_MEDICAO')}",
+                        'temperatura_c': item.get('TEMP_INS'),
+                        'umidade_relativa': item.get('UMID_INS'),
+                        'pressao_hpa': item.get('PRES_INS'),
+                        'velocidade_vento_ms': item.get('VETO_VEL'),
+                    })
+
+            if dados_estacao:
+                print(f"  - Estação {codigo_estacao} ({estacao.get('DC_NOME', 'N/A')}) tem dados.")
+                mesclar_colunas(dados_coletados, dados_estacao)
+        except (requests.exceptions.RequestException, *ERROS_JSON):
             # Ignora erros de requisição ou JSON para uma única estação
+            houve_falha = True
             continue
             
-    print(f"INMET: {len(dados_coletados)} registros encontrados.")
+    print(f"INMET: {contar_registros(dados_coletados)} registros encontrados.")
+    # Sem dados por causa de falhas (e não por falta de medições): a consulta deve ser repetida
+    if not dados_coletados and houve_falha:
+        return None
     return dados_coletados
 
 # Bloco de teste
@@ -94,7 +105,7 @@ if __name__ == '__main__':
     resultados_inmet = obter_dados_inmet(data_inicio_teste, data_fim_teste, lat_teste, lon_teste)
 
     if resultados_inmet:
-        print(f"\nTotal de {len(resultados_inmet)} registros do INMET encontrados.")
+        print(f"\nTotal de {contar_registros(resultados_inmet)} registros do INMET encontrados.")
         # Imprime o primeiro e o último registro como exemplo
-        print("Primeiro registro:", resultados_inmet[0])
-        print("Último registro:", resultados_inmet[-1])
+        print("Primeiro registro:", {col: valores[0] for col, valores in resultados_inmet.items()})
+        print("Último registro:", {col: valores[-1] for col, valores in resultados_inmet.items()})
@@ -3,6 +3,9 @@ from datetime import datetime, timezone
 import time
 import pytz
 
+from provedores.erros import ErroPermanente
+from provedores.decodificacao import ERROS_JSON, carregar_json, acumular_registro, contar_registros
+
 def _date_to_unix_timestamp(dt_obj_local):
     """Converte um objeto datetime local para um timestamp Unix UTC."""
     # Garante que o objeto datetime tenha informação de fuso horário
@@ -26,15 +29,20 @@ def obter_dados_openweathermap(api_key, data_inicio, data_fim, latitude, longitu
         longitude (float): Longitude do local.
 
     Returns:
-        list: Uma lista de dicionários com os dados coletados.
+        dict: Colunas (dicionário de listas) com os dados coletados, ou
+            None em caso de falha (a consulta deve ser repetida). Se qualquer janela
+            do período falhar, o período inteiro é considerado falho.
+
+    Raises:
+        ErroPermanente: Se a chave de API não estiver configurada ou o acesso for negado (401/403).
     """
     print("--- Executando OpenWeatherMap ---")
     if not api_key:
-        print("Chave de API do OpenWeatherMap não configurada. Pulando...")
-        return []
+        raise ErroPermanente("Chave de API do OpenWeatherMap não configurada.")
 
     base_url = "https://history.openweathermap.org/data/2.5/history/city"
-    dados_coletados = []
+    dados_coletados = {}
+    houve_falha = False
 
     start_timestamp = _date_to_unix_timestamp(data_inicio)
     end_timestamp = _date_to_unix_timestamp(data_fim)
@@ -55,13 +63,14 @@ def obter_dados_openweathermap(api_key, data_inicio, data_fim, latitude, longitu
         try:
             response = requests.get(base_url, params=params, timeout=20)
             response.raise_for_status()
-            data = response.json()
+            data = carregar_json(response.content)
 
             if 'list' in data:
                 for item in data['list']:
-                    dados_coletados.append({
+                    acumular_registro(dados_coletados, {
                         'provedor': 'OpenWeatherMap',
-                        'data_hora': datetime.fromtimestamp(item['dt'], tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                        # Mantém o timestamp Unix (UTC) da API; a conversão é feita na consolidação
+                        'data_hora': item['dt'],
                         'temperatura_c': item.get('main', {}).get('temp', None) - 273.15 if item.get('main', {}).get('temp') else None,
                         'umidade_relativa': item.get('main', {}).get('humidity'),
                         'pressao_hpa': item.get('main', {}).get('pressure'),
@@ -74,20 +83,28 @@ def obter_dados_openweathermap(api_key, data_inicio, data_fim, latitude, longitu
             # A API do OWM retorna 400 para períodos sem dados, então tratamos isso de forma mais branda
             if e.response.status_code == 400:
                  print(f"  - Nenhum dado encontrado no OpenWeatherMap para o período solicitado.")
+            elif e.response.status_code in (401, 403):
+                # O histórico exige plano pago: com a chave gratuita nenhuma janela vai funcionar
+                raise ErroPermanente(f"Acesso negado pelo OpenWeatherMap ({e.response.status_code}).")
             else:
                 print(f"  - Erro na requisição: {e.response.status_code} para o período {current_start} - {current_end}")
+                houve_falha = True
             # Não interrompe o loop, apenas continua para o próximo período
         except requests.exceptions.RequestException as e:
             print(f"  - Erro de conexão: {e}")
+            houve_falha = True
             # Pára a execução para este provedor em caso de falha de conexão
             break
-        except json.JSONDecodeError:
+        except ERROS_JSON:
             print("  - Erro ao decodificar a resposta JSON do OpenWeatherMap.")
+            houve_falha = True
 
         current_start = current_end
         time.sleep(1) # Delay para não sobrecarregar a API
 
-    print(f"OpenWeatherMap: {len(dados_coletados)} registros encontrados.")
+    print(f"OpenWeatherMap: {contar_registros(dados_coletados)} registros encontrados.")
+    if houve_falha:
+        return None
     return dados_coletados
 
 # Bloco de teste
@@ -107,8 +124,8 @@ if __name__ == '__main__':
     if API_KEY_TESTE:
         resultados_owm = obter_dados_openweathermap(API_KEY_TESTE, DATA_INICIO_TESTE, DATA_FIM_TESTE, LAT_TESTE, LON_TESTE)
         if resultados_owm:
-            print(f"\nTotal de {len(resultados_owm)} registros do OpenWeatherMap encontrados.")
-            print("Primeiro registro:", resultados_owm[0])
-            print("Último registro:", resultados_owm[-1])
+            print(f"\nTotal de {contar_registros(resultados_owm)} registros do OpenWeatherMap encontrados.")
+            print("Primeiro registro:", {col: valores[0] for col, valores in resultados_owm.items()})
+            print("Último registro:", {col: valores[-1] for col, valores in resultados_owm.items()})
     else:
         print("\nChave de API 'OPENWEATHERMAP_API_KEY' não encontrada no arquivo .env para teste.")
@@ -1,8 +1,11 @@
 import requests
-import json
 from datetime import datetime
 from geopy.distance import geodesic
 
+from provedores.decodificacao import (
+    ERROS_JSON, carregar_json, iterar_itens, fluxo_requests, acumular_registro, contar_registros
+)
+
 # URL da API 'escondida' que lista todas as estações de todas as entidades
 URL_TODAS_ESTACOES = "https://apimapas.inmet.gov.br/estacoes"
 
@@ -14,8 +17,9 @@ def _get_all_stations():
     try:
         response = requests.get(URL_TODAS_ESTACOES, timeout=20)
         response.raise_for_status()
-        data = response.json()
-        
+        # Decodifica o buffer bruto direto (orjson, quando disponível), sem passar pelo .json() do requests
+        data = carregar_json(response.content)
+
         all_stations = []
         # O JSON é aninhado, precisamos iterar para achatar a lista
         for tipo_estacao in data['estacoes'].values(): # ex: 'automaticas', 'convencionais'
@@ -29,12 +33,18 @@ def _get_all_stations():
 def obter_dados_portal_inmet(data_inicio, data_fim, latitude, longitude):
     """
     Busca dados de estações (de todas as entidades) próximas a uma coordenada.
+
+    Returns:
+        dict: Colunas (dicionário de listas) com os dados da estação mais próxima que tiver dados, ou
+            None em caso de falha (a consulta deve ser repetida).
     """
     print("--- Executando Portal INMET  ---")
     
     stations = _get_all_stations()
+    if stations is None:
+        return None
     if not stations:
-        return []
+        return {}
 
     # Filtra as estações próximas (ex: raio de 100 km)
     coordenadas_local = (latitude, longitude)
@@ -55,14 +65,15 @@ def obter_dados_portal_inmet(data_inicio, data_fim, latitude, longitude):
 
     if not estacoes_proximas:
         print("  - Nenhuma estação encontrada em um raio de 100 km.")
-        return []
+        return {}
 
     # Ordena as estações encontradas pela distância (da mais próxima para a mais distante)
     estacoes_proximas.sort(key=lambda x: x['distancia'])
     print(f"  - {len(estacoes_proximas)} estações encontradas. Testando a mais próxima primeiro...")
 
     # Tenta buscar dados, começando pela estação mais próxima
-    dados_coletados = []
+    dados_coletados = {}
+    houve_falha = False
     for estacao in estacoes_proximas:
         codigo_estacao = estacao['codigo']
         nome_estacao = estacao['nome']
@@ -72,32 +83,45 @@ def obter_dados_portal_inmet(data_inicio, data_fim, latitude, longitude):
         url_dados = f"{URL_DADOS_ESTACAO}/{data_inicio.strftime('%Y-%m-%d')}/{data_fim.strftime('%Y-%m-%d')}/{codigo_estacao}"
         
         try:
-            response_dados = requests.get(url_dados, timeout=20)
-            if response_dados.status_code == 200:
-                dados = response_dados.json()
-                if dados:
-                    print(f"  - SUCESSO! Dados encontrados para a estação {nome_estacao} ({entidade}) a {dist:.1f} km.")
-                    for item in dados:
-                        dados_coletados.append({
-                            'provedor': 'PortalINMET',
-                            'estacao_codigo': codigo_estacao,
-                            'estacao_nome': nome_estacao,
-                            'entidade': entidade,
-                            'data_hora': f"{item.get('DT_MEDICAO')} {item.get('HR_MEDICAO')}",
-                            'temperatura_c': item.get('TEMP_INS'),
-                            'umidade_relativa': item.get('UMID_INS'),
-                            'pressao_hpa': item.get('PRES_INS'),
-                            'velocidade_vento_ms': item.get('VETO_VEL'),
-                            'chuva_mm': item.get('CHUVA'),
-                            'radiacao_solar_kj_m2': item.get('RAD_GLO'),
-                        })
-                    # Se encontramos dados na estação mais próxima, paramos a busca
-                    break 
+            with requests.get(url_dados, timeout=20, stream=True) as response_dados:
+                if response_dados.status_code != 200:
+                    continue
+
+                # Os registros só são aceitos se a leitura da estação terminar sem erros
+                dados_estacao = {}
+                for item in iterar_itens(fluxo_requests(response_dados), 'item'):
+                    acumular_registro(dados_estacao, {
+                        'provedor': 'PortalINMET',
+                        'estacao_codigo': codigo_estacao,
+                        'estacao_nome': nome_estacao,
+                        'entidade': entidade,
+                        'data_hora': f"{item.get('DT_MEDICAO')} {item.get('HR_MEDICAO')}",
+                        'temperatura_c': item.get('TEMP_INS'),
+                        'umidade_relativa': item.get('UMID_INS'),
+                        'pressao_hpa': item.get('PRES_INS'),
+                        'velocidade_vento_ms': item.get('VETO_VEL'),
+                        'chuva_mm': item.get('CHUVA'),
+                        'radiacao_solar_kj_m2': item.get('RAD_GLO'),
+                    })
+
+            if dados_estacao:
+                print(f"  - SUCESSO! Dados encontrados para a estação {nome_estacao} ({entidade}) a {dist:.1f} km.")
+                dados_coletados = dados_estacao
+                # Se encontramos dados na estação mais próxima, paramos a busca
+                break
         except requests.exceptions.RequestException as e:
             print(f"  - Falha ao contatar a estação {nome_estacao} ({entidade}): {e}. Tentando a próxima...")
+            houve_falha = True
+            continue
+        except ERROS_JSON as e:
+            print(f"  - Resposta inválida da estação {nome_estacao} ({entidade}): {e}. Tentando a próxima...")
+            houve_falha = True
             continue
 
-    print(f"Portal INMET: {len(dados_coletados)} registros encontrados.")
+    print(f"Portal INMET: {contar_registros(dados_coletados)} registros encontrados.")
+    # Sem dados por causa de falhas (e não por falta de medições): a consulta deve ser repetida
+    if not dados_coletados and houve_falha:
+        return None
     return dados_coletados
 
 # Bloco de teste
@@ -109,6 +133,6 @@ if __name__ == '__main__':
 
     resultados = obter_dados_portal_inmet(data_inicio_teste, data_fim_teste, lat_teste, lon_teste)
     if resultados:
-        print(f"\nTotal de {len(resultados)} registros encontrados.")
+        print(f"\nTotal de {contar_registros(resultados)} registros encontrados.")
         df_teste = pd.DataFrame(resultados)
         print(df_teste.head())
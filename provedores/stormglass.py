@@ -1,6 +1,9 @@
 import requests
 from datetime import datetime, timezone
 
+from provedores.erros import ErroPermanente
+from provedores.decodificacao import carregar_json, acumular_registro, contar_registros
+
 def obter_dados_stormglass(api_key, data_inicio, data_fim, latitude, longitude):
     """
     Busca dados históricos do StormGlass para um período e local.
@@ -13,12 +16,15 @@ def obter_dados_stormglass(api_key, data_inicio, data_fim, latitude, longitude):
         longitude (float): Longitude do local.
 
     Returns:
-        list: Uma lista de dicionários com os dados coletados.
+        dict: Colunas (dicionário de listas) com os dados coletados, ou
+            None em caso de falha (a consulta deve ser repetida).
+
+    Raises:
+        ErroPermanente: Se a chave de API não estiver configurada ou o acesso for negado (401/403).
     """
     print("--- Executando StormGlass ---")
     if not api_key:
-        print("Chave de API do StormGlass não configurada. Pulando...")
-        return []
+        raise ErroPermanente("Chave de API do StormGlass não configurada.")
 
     base_url = "https://api.stormglass.io/v2/weather/point"
     headers = {
@@ -43,12 +49,12 @@ def obter_dados_stormglass(api_key, data_inicio, data_fim, latitude, longitude):
     try:
         response = requests.get(base_url, headers=headers, params=query_params)
         response.raise_for_status()
-        data = response.json()
+        data = carregar_json(response.content)
 
-        dados_coletados = []
+        dados_coletados = {}
         if 'hours' in data:
             for item in data['hours']:
-                dados_coletados.append({
+                acumular_registro(dados_coletados, {
                     'provedor': 'StormGlass',
                     'data_hora': item.get('time'),
                     'temperatura_c': item.get('airTemperature', {}).get('noaa'),
@@ -57,23 +63,26 @@ def obter_dados_stormglass(api_key, data_inicio, data_fim, latitude, longitude):
                     'velocidade_vento_ms': item.get('windSpeed', {}).get('noaa'),
                 })
         
-        print(f"StormGlass: {len(dados_coletados)} registros encontrados.")
+        print(f"StormGlass: {contar_registros(dados_coletados)} registros encontrados.")
         return dados_coletados
 
     except requests.exceptions.HTTPError as e:
         # O plano gratuito do StormGlass tem um limite baixo (ex: 10 requisições/dia).
         # Erros de conexão ou status (como 402 - Payment Required) podem ocorrer se o limite for excedido.
         if e.response.status_code == 402:
+            # Os dados existem, só não foram entregues hoje: conta como falha para tentar de novo depois
             print("  - Limite diário do StormGlass excedido. Pulando...")
-            return []
+            return None
+        if e.response.status_code in (401, 403):
+            raise ErroPermanente(f"Acesso negado pelo StormGlass ({e.response.status_code}).")
         print(f"  - Erro na requisição ao StormGlass: {e.response.status_code} - {e.response.text}")
-        return []
+        return None
     except requests.exceptions.RequestException as e:
         print(f"  - Erro de conexão com o StormGlass: {e}")
-        return []
+        return None
     except Exception as e:
         print(f"  - Ocorreu um erro inesperado no StormGlass: {e}")
-        return []
+        return None
 
 # Bloco de teste
 if __name__ == '__main__':
@@ -94,8 +103,8 @@ if __name__ == '__main__':
     if API_KEY_TESTE:
         resultados_sg = obter_dados_stormglass(API_KEY_TESTE, DATA_INICIO_TESTE, DATA_FIM_TESTE, LAT_TESTE, LON_TESTE)
         if resultados_sg:
-            print(f"\nTotal de {len(resultados_sg)} registros do StormGlass encontrados.")
-            print("Primeiro registro:", resultados_sg[0])
-            print("Último registro:", resultados_sg[-1])
+            print(f"\nTotal de {contar_registros(resultados_sg)} registros do StormGlass encontrados.")
+            print("Primeiro registro:", {col: valores[0] for col, valores in resultados_sg.items()})
+            print("Último registro:", {col: valores[-1] for col, valores in resultados_sg.items()})
     else:
         print("\nChave de API 'STORMGLASS_API_KEY' não encontrada no arquivo .env para teste.")
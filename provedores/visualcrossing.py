@@ -2,8 +2,9 @@ import urllib.request
 import urllib.parse
 import csv
 import codecs
-import json
-from datetime import datetime
+
+from provedores.erros import ErroPermanente
+from provedores.decodificacao import iterar_itens, acumular_registro, contar_registros
 
 def obter_dados_visualcrossing(api_key, data_inicio, data_fim, local):
     """
@@ -16,12 +17,15 @@ def obter_dados_visualcrossing(api_key, data_inicio, data_fim, local):
         local (str): Nome do local (ex: "Toledo, PR").
 
     Returns:
-        list: Uma lista de dicionários com os dados climaticos horários.
+        dict: Colunas (dicionário de listas) com os dados climaticos horários, ou
+            None em caso de falha (a consulta deve ser repetida).
+
+    Raises:
+        ErroPermanente: Se a chave de API não estiver configurada ou o acesso for negado (401/403).
     """
     print("--- Executando Visual Crossing ---")
     if not api_key:
-        print("Chave de API do Visual Crossing não configurada. Pulando...")
-        return []
+        raise ErroPermanente("Chave de API do Visual Crossing não configurada.")
 
     start_date_str = data_inicio.strftime('%Y-%m-%d')
     end_date_str = data_fim.strftime('%Y-%m-%d')
@@ -30,39 +34,37 @@ def obter_dados_visualcrossing(api_key, data_inicio, data_fim, local):
     # Usaremos JSON para facilitar o parsing, em vez de CSV
     url = f"https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline/{encoded_location}/{start_date_str}/{end_date_str}?unitGroup=metric&include=hours&key={api_key}&contentType=json"
 
-    dados_coletados = []
+    dados_coletados = {}
     try:
         response = urllib.request.urlopen(url)
-        data = json.loads(response.read().decode('utf-8'))
 
-        if 'days' in data:
-            for day in data['days']:
-                for hour in day.get('hours', []):
-                    # Converte a data e a hora para um formato padrão
-                    data_hora_str = f"{day['datetime']} {hour['datetime']}"
-                    data_hora_obj = datetime.strptime(data_hora_str, '%Y-%m-%d %H:%M:%S')
-                    
-                    dados_coletados.append({
-                        'provedor': 'VisualCrossing',
-                        'data_hora': data_hora_obj.strftime('%Y-%m-%d %H:%M:%S'),
-                        'temperatura_c': hour.get('temp'),
-                        'umidade_relativa': hour.get('humidity'),
-                        'pressao_hpa': hour.get('pressure'),
-                        # A API retorna em km/h, convertemos para m/s para padronizar
-                        'velocidade_vento_ms': float(hour.get('windspeed', 0)) / 3.6 if hour.get('windspeed') is not None else None,
-                        'radiacao_solar_w_m2': hour.get('solarradiation')
-                    })
+        # Lê um dia por vez direto do corpo da resposta, sem carregar a linha do tempo inteira
+        for day in iterar_itens(response, 'days.item'):
+            for hour in day.get('hours', []):
+                acumular_registro(dados_coletados, {
+                    'provedor': 'VisualCrossing',
+                    # Timestamp Unix (UTC) da hora; 'datetime' é o horário local do lugar consultado
+                    'data_hora': hour.get('datetimeEpoch'),
+                    'temperatura_c': hour.get('temp'),
+                    'umidade_relativa': hour.get('humidity'),
+                    'pressao_hpa': hour.get('pressure'),
+                    # A API retorna em km/h, convertemos para m/s para padronizar
+                    'velocidade_vento_ms': float(hour.get('windspeed', 0)) / 3.6 if hour.get('windspeed') is not None else None,
+                    'radiacao_solar_w_m2': hour.get('solarradiation')
+                })
 
-        print(f"Visual Crossing: {len(dados_coletados)} registros encontrados.")
+        print(f"Visual Crossing: {contar_registros(dados_coletados)} registros encontrados.")
         return dados_coletados
 
     except urllib.error.HTTPError as e:
         error_info = e.read().decode()
+        if e.code in (401, 403):
+            raise ErroPermanente(f"Acesso negado pelo Visual Crossing ({e.code}): {error_info}")
         print(f'  - Erro na requisição ao Visual Crossing: {e.code} - {error_info}')
-        return []
+        return None
     except Exception as e:
         print(f"  - Ocorreu um erro inesperado no Visual Crossing: {e}")
-        return []
+        return None
 
 # Bloco de teste
 if __name__ == '__main__':
@@ -79,8 +81,8 @@ if __name__ == '__main__':
     if API_KEY_TESTE:
         resultados_vc = obter_dados_visualcrossing(API_KEY_TESTE, DATA_INICIO_TESTE, DATA_FIM_TESTE, LOCAL_TESTE)
         if resultados_vc:
-            print(f"\nTotal de {len(resultados_vc)} registros do Visual Crossing encontrados.")
-            print("Primeiro registro:", resultados_vc[0])
-            print("Último registro:", resultados_vc[-1])
+            print(f"\nTotal de {contar_registros(resultados_vc)} registros do Visual Crossing encontrados.")
+            print("Primeiro registro:", {col: valores[0] for col, valores in resultados_vc.items()})
+            print("Último registro:", {col: valores[-1] for col, valores in resultados_vc.items()})
     else:
         print("\nChave de API 'VISUALCROSSING_API_KEY' não encontrada no arquivo .env para teste.")
@@ -1,6 +1,8 @@
 import wolframalpha
 from datetime import datetime
 
+from provedores.erros import ErroPermanente
+
 def obter_dados_wolfram(api_key, data, local):
     """
     Busca dados de clima no WolframAlpha para uma data e local específicos.
@@ -11,12 +13,15 @@ def obter_dados_wolfram(api_key, data, local):
         local (str): O nome do local (ex: "Toledo, Brazil").
 
     Returns:
-        list: Uma lista contendo um dicionário com a informação de clima encontrada.
+        list: Uma lista contendo um dicionário com a informação de clima encontrada, ou
+            None em caso de falha (a consulta deve ser repetida).
+
+    Raises:
+        ErroPermanente: Se a chave de API não estiver configurada.
     """
     print("--- Executando WolframAlpha ---")
     if not api_key:
-        print("Chave de API do WolframAlpha não configurada. Pulando...")
-        return []
+        raise ErroPermanente("Chave de API do WolframAlpha não configurada.")
 
     try:
         cliente = wolframalpha.Client(api_key)
@@ -54,7 +59,7 @@ def obter_dados_wolfram(api_key, data, local):
           # mesmo com uma chave de API válida, possivelmente devido a uma incompatibilidade
           # ou por não encontrar dados para a consulta específica.
         print(f"  - Erro na requisição ao WolframAlpha: {e}")
-        return []
+        return None
 
 # Bloco de teste, essa parte é apenas para teste executando diretamente esse código, essa parte é ignorada ao rodar o main.py
 if __name__ == '__main__':
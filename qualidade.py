@@ -0,0 +1,179 @@
+"""
+Módulo de Controle de Qualidade.
+
+Depois da consolidação, cada variável (ex: temperatura) forma uma matriz
+hora × provedor. As verificações abaixo são feitas de uma vez sobre essa matriz
+com NumPy:
+
+- Faixa: valores fisicamente impossíveis são descartados.
+- Salto: picos isolados (variação brusca em relação à hora anterior E à seguinte)
+  são descartados.
+- Divergência: com pelo menos 3 provedores na mesma hora, valores muito distantes
+  da mediana entre provedores são sinalizados (mas mantidos).
+- Preenchimento (opcional): lacunas de um provedor são preenchidas com o provedor
+  que mais concorda com ele, corrigido pela diferença mediana entre os dois.
+
+Cada coluna `<variavel>_<provedor>` ganha uma coluna `<variavel>_<provedor>_qc` com
+as sinalizações (soma dos valores FLAG_*; 0 significa valor presente e aprovado em
+todas as verificações, FLAG_AUSENTE que o provedor não tinha valor naquela hora), e cada variável comparável entre provedores
+ganha uma coluna `<variavel>_divergencia` com o maior desvio em relação à mediana
+naquela hora.
+"""
+import numpy as np
+import pandas as pd
+
+# Sinalizações de qualidade (combinadas por soma/bit a bit na coluna '_qc')
+FLAG_FORA_FAIXA = 1
+FLAG_SALTO = 2
+FLAG_DIVERGENTE = 4
+FLAG_PREENCHIDO = 8
+FLAG_AUSENTE = 16
+
+# Limites por variável:
+# - 'faixa': valores mínimo e máximo aceitos.
+# - 'salto': maior variação aceita de uma hora para a outra (None para não verificar).
+# - 'divergencia': maior desvio aceito em relação à mediana dos provedores (None para não verificar).
+LIMITES = {
+    'temperatura_c': {'faixa': (-40, 60), 'salto': 10, 'divergencia': 5},
+    'umidade_relativa': {'faixa': (0, 100), 'salto': 40, 'divergencia': 25},
+    # O INMET informa a pressão na estação e os demais ao nível do mar, então não há comparação entre eles
+    'pressao_hpa': {'faixa': (500, 1100), 'salto': 10, 'divergencia': None},
+    'velocidade_vento_ms': {'faixa': (0, 75), 'salto': 25, 'divergencia': 8},
+    'chuva_mm': {'faixa': (0, 200), 'salto': None, 'divergencia': None},
+    'radiacao_solar_w_m2': {'faixa': (0, 1500), 'salto': None, 'divergencia': None},
+    'radiacao_solar_kj_m2': {'faixa': (0, 5000), 'salto': None, 'divergencia': None},
+}
+
+# Mínimo de provedores com valor na mesma hora para avaliar a divergência
+MINIMO_PROVEDORES_DIVERGENCIA = 3
+
+# Mínimo de horas em comum entre dois provedores para usar um no preenchimento do outro
+MINIMO_HORAS_EM_COMUM = 3
+
+
+def converter_variaveis_numericas(df):
+    """Converte para número as colunas de variáveis conhecidas (alguns provedores as entregam como texto)."""
+    for coluna in df.columns.intersection(list(LIMITES)):
+        df[coluna] = pd.to_numeric(df[coluna], errors='coerce')
+    return df
+
+
+def _colunas_da_variavel(df, variavel):
+    """Retorna as colunas '<variavel>_<provedor>' presentes no DataFrame."""
+    prefixo = f"{variavel}_"
+    return [
+        coluna for coluna in df.columns
+        if coluna.startswith(prefixo) and not coluna.endswith(('_qc', '_divergencia'))
+    ]
+
+
+def _sinalizar_saltos(valores, salto):
+    """Marca picos isolados: valores que diferem mais que `salto` da hora anterior e da seguinte."""
+    diferencas = np.abs(np.diff(valores, axis=0))
+    with np.errstate(invalid='ignore'):
+        excede = diferencas > salto
+    picos = np.zeros(valores.shape, dtype=bool)
+    picos[1:-1] = excede[:-1] & excede[1:]
+    return picos
+
+
+def _preencher_lacunas(valores, flags):
+    """Preenche as lacunas de cada provedor com o provedor mais concordante (corrigido pelo viés)."""
+    n_provedores = valores.shape[1]
+    preenchidos = valores.copy()
+    for alvo in range(n_provedores):
+        lacunas = np.isnan(valores[:, alvo])
+        if not lacunas.any():
+            continue
+
+        melhor, melhor_erro, melhor_vies = None, np.inf, 0.0
+        for fonte in range(n_provedores):
+            if fonte == alvo:
+                continue
+            diferenca = valores[:, alvo] - valores[:, fonte]
+            diferenca = diferenca[~np.isnan(diferenca)]
+            if diferenca.size < MINIMO_HORAS_EM_COMUM:
+                continue
+            vies = np.median(diferenca)
+            erro = np.median(np.abs(diferenca - vies))
+            if erro < melhor_erro:
+                melhor, melhor_erro, melhor_vies = fonte, erro, vies
+
+        if melhor is None:
+            continue
+        preencher = lacunas & ~np.isnan(valores[:, melhor])
+        preenchidos[preencher, alvo] = valores[preencher, melhor] + melhor_vies
+        flags[preencher, alvo] |= FLAG_PREENCHIDO
+    return preenchidos
+
+
+def aplicar_controle_qualidade(df, preencher_lacunas=False):
+    """
+    Aplica o controle de qualidade sobre os dados consolidados (um provedor por coluna).
+
+    Args:
+        df (pd.DataFrame): Dados horários, com colunas no formato '<variavel>_<provedor>'.
+        preencher_lacunas (bool): Se True, preenche lacunas com o provedor mais concordante.
+
+    Returns:
+        pd.DataFrame: Os dados após o controle, com as colunas de sinalização adicionadas.
+    """
+    resultado = df.copy()
+    novas_colunas = {}
+    for variavel, limites in LIMITES.items():
+        colunas = _colunas_da_variavel(df, variavel)
+        if not colunas:
+            continue
+
+        valores = df[colunas].to_numpy(dtype=float, copy=True)
+        flags = np.zeros(valores.shape, dtype=np.int8)
+        ausentes = np.isnan(valores)
+
+        # 1. Faixa
+        minimo, maximo = limites['faixa']
+        with np.errstate(invalid='ignore'):
+            fora_faixa = (valores < minimo) | (valores > maximo)
+        flags[fora_faixa] |= FLAG_FORA_FAIXA
+        valores[fora_faixa] = np.nan
+
+        # 2. Salto (picos isolados)
+        if limites['salto'] is not None and valores.shape[0] > 2:
+            picos = _sinalizar_saltos(valores, limites['salto'])
+            flags[picos] |= FLAG_SALTO
+            valores[picos] = np.nan
+
+        # 3. Divergência entre provedores
+        divergencia = None
+        if limites['divergencia'] is not None and len(colunas) > 1:
+            validos_por_hora = np.sum(~np.isnan(valores), axis=1)
+            com_valor = validos_por_hora > 0
+            mediana = np.full(valores.shape[0], np.nan)
+            divergencia = np.full(valores.shape[0], np.nan)
+            if com_valor.any():
+                mediana[com_valor] = np.nanmedian(valores[com_valor], axis=1)
+            desvios = np.abs(valores - mediana[:, None])
+            if com_valor.any():
+                divergencia[com_valor] = np.nanmax(desvios[com_valor], axis=1)
+            divergencia[validos_por_hora < 2] = np.nan
+
+            with np.errstate(invalid='ignore'):
+                divergentes = desvios > limites['divergencia']
+            divergentes &= (validos_por_hora >= MINIMO_PROVEDORES_DIVERGENCIA)[:, None]
+            flags[divergentes] |= FLAG_DIVERGENTE
+
+        # 4. Preenchimento de lacunas
+        if preencher_lacunas and len(colunas) > 1:
+            valores = np.clip(_preencher_lacunas(valores, flags), minimo, maximo)
+
+        # 5. Valores que o provedor nunca teve (e que não foram preenchidos)
+        flags[ausentes & np.isnan(valores)] |= FLAG_AUSENTE
+
+        for i, coluna in enumerate(colunas):
+            resultado[coluna] = valores[:, i]
+            novas_colunas[f"{coluna}_qc"] = flags[:, i]
+        if divergencia is not None:
+            novas_colunas[f"{variavel}_divergencia"] = divergencia
+
+    if not novas_colunas:
+        return resultado
+    return pd.concat([resultado, pd.DataFrame(novas_colunas, index=df.index)], axis=1)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Permite importar os módulos da raiz do projeto (main, coleta, provedores, ...) nos testes
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+
+import coleta
+import config
+
+
+@pytest.fixture(autouse=True)
+def diretorio_temporario(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'DIRETORIO_COLETAS', str(tmp_path))
+
+
+def _provedor_falso(respostas):
+    """Cria um provedor que devolve as respostas em ordem e registra as chamadas."""
+    chamadas = []
+
+    def provedor(unidade_id):
+        chamadas.append(unidade_id)
+        return respostas[unidade_id].pop(0)
+
+    return provedor, chamadas
+
+
+def _executar(provedor, unidades):
+    manifesto = coleta.abrir_coleta('teste')
+    coleta.registrar_unidades(manifesto, [('P', u) for u in unidades])
+    acumulado = None
+    for unidade_id in unidades:
+        dados = coleta.executar_unidade(manifesto, 'P', unidade_id, provedor, unidade_id)
+        acumulado = coleta.mesclar_dados(acumulado, dados)
+    return manifesto, acumulado
+
+
+def test_retoma_apenas_unidades_que_falharam():
+    respostas = {
+        'a': [{'x': [1, 2]}],
+        'b': [None, {'x': [3]}],  # falha na primeira execução
+        'c': [{}],  # sem dados no período: conclui a unidade
+    }
+    provedor, chamadas = _provedor_falso(respostas)
+
+    manifesto, dados = _executar(provedor, ['a', 'b', 'c'])
+    assert dados == {'x': [1, 2]}
+    assert manifesto['unidades']['P__b']['estado'] == 'pendente'
+    assert manifesto['unidades']['P__c']['estado'] == 'concluida'
+
+    manifesto, dados = _executar(provedor, ['a', 'b', 'c'])
+    assert chamadas == ['a', 'b', 'c', 'b']
+    assert dados == {'x': [1, 2, 3]}
+    assert manifesto['unidades']['P__b']['tentativas'] == 2
+    assert all(u['estado'] == 'concluida' for u in manifesto['unidades'].values())
+
+
+def test_mesclar_dados_listas_e_vazios():
+    assert coleta.mesclar_dados(None, None) is None
+    assert coleta.mesclar_dados(None, []) == []
+    assert coleta.mesclar_dados([{'a': 1}], None) == [{'a': 1}]
+    assert coleta.mesclar_dados([{'a': 1}], [{'a': 2}]) == [{'a': 1}, {'a': 2}]
+
+
+def test_dividir_periodo_e_job_id():
+    blocos = coleta.dividir_periodo(datetime(2024, 7, 1), datetime(2024, 7, 10), 7)
+
+    assert blocos == [
+        (datetime(2024, 7, 1), datetime(2024, 7, 8)),
+        (datetime(2024, 7, 8), datetime(2024, 7, 10)),
+    ]
+    assert coleta.gerar_job_id('Toledo, Parana', datetime(2024, 7, 1), datetime(2024, 7, 10)) == \
+        'Toledo_Parana_20240701_20240710'
+
+
+def test_erro_permanente_ignora_as_demais_unidades_do_provedor():
+    chamadas = []
+
+    def provedor(unidade_id):
+        chamadas.append(unidade_id)
+        raise coleta.ErroPermanente("Chave de API não configurada.")
+
+    manifesto, dados = _executar(provedor, ['a', 'b', 'c'])
+    assert dados is None
+    assert chamadas == ['a']
+    assert all(u['estado'] == 'erro_permanente' for u in manifesto['unidades'].values())
+
+    # Uma nova execução não consulta o provedor de novo
+    _executar(provedor, ['a', 'b', 'c'])
+    assert chamadas == ['a']
+
+
+def test_unidade_para_de_ser_tentada_apos_maximo_de_tentativas():
+    respostas = {'a': [None] * coleta.MAXIMO_TENTATIVAS}
+    provedor, chamadas = _provedor_falso(respostas)
+
+    for _ in range(coleta.MAXIMO_TENTATIVAS + 2):
+        manifesto, _ = _executar(provedor, ['a'])
+
+    assert len(chamadas) == coleta.MAXIMO_TENTATIVAS
+    assert manifesto['unidades']['P__a']['estado'] == 'erro_permanente'
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from provedores import decodificacao
+
+DOCUMENTO = (
+    b'{"days": [{"datetime": "2024-07-20", "hours": [{"temp": 20.5}, {"temp": 21.0}]},'
+    b' {"datetime": "2024-07-21", "hours": []}], "timezone": "America/Sao_Paulo"}'
+)
+
+
+class RespostaFalsa:
+    """Imita uma resposta do requests com stream=True, entregando o corpo em blocos."""
+
+    def __init__(self, blocos, erro=None):
+        self.blocos = blocos
+        self.erro = erro
+
+    def iter_content(self, chunk_size=1):
+        for bloco in self.blocos:
+            yield bloco
+        if self.erro is not None:
+            raise self.erro
+
+
+@pytest.fixture(params=['ijson', 'fallback'])
+def modo_leitura(request, monkeypatch):
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(decodificacao, 'ijson', None)
+    return request.param
+
+
+def test_iterar_itens_percorre_o_caminho(modo_leitura):
+    dias = list(decodificacao.iterar_itens(io.BytesIO(DOCUMENTO), 'days.item'))
+
+    assert [dia['datetime'] for dia in dias] == ['2024-07-20', '2024-07-21']
+    assert dias[0]['hours'][1]['temp'] == 21.0
+    assert isinstance(dias[0]['hours'][0]['temp'], float)
+
+
+def test_iterar_itens_lista_raiz_e_null(modo_leitura):
+    assert list(decodificacao.iterar_itens(io.BytesIO(b'[1, 2, 3]'), 'item')) == [1, 2, 3]
+    assert list(decodificacao.iterar_itens(io.BytesIO(b'null'), 'item')) == []
+
+
+def test_iterar_itens_json_invalido(modo_leitura):
+    with pytest.raises(decodificacao.ERROS_JSON):
+        list(decodificacao.iterar_itens(io.BytesIO(b'[{"a": 1}, '), 'item'))
+
+
+def test_fluxo_requests_em_blocos(modo_leitura):
+    blocos = [DOCUMENTO[i:i + 7] for i in range(0, len(DOCUMENTO), 7)]
+    fluxo = decodificacao.fluxo_requests(RespostaFalsa(blocos))
+
+    dias = list(decodificacao.iterar_itens(fluxo, 'days.item'))
+
+    assert len(dias) == 2
+
+
+def test_fluxo_requests_repassa_erros_de_leitura(modo_leitura):
+    fluxo = decodificacao.fluxo_requests(RespostaFalsa([b'[{"a": 1}, '], erro=ConnectionError('reset')))
+
+    with pytest.raises(ConnectionError):
+        list(decodificacao.iterar_itens(fluxo, 'item'))
+
+
+def test_acumular_e_mesclar_colunas():
+    colunas = {}
+    decodificacao.acumular_registro(colunas, {'a': 1, 'b': 'x'})
+    decodificacao.acumular_registro(colunas, {'a': 2, 'b': 'y'})
+    decodificacao.mesclar_colunas(colunas, {'a': [3], 'b': ['z']})
+
+    assert colunas == {'a': [1, 2, 3], 'b': ['x', 'y', 'z']}
+    assert decodificacao.contar_registros(colunas) == 3
+    assert decodificacao.contar_registros({}) == 0
@@ -0,0 +1,60 @@
+import glob
+
+import pandas as pd
+
+import main
+
+
+def test_salvar_dados_consolidados_com_colunas_de_texto(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dados = {
+        'PortalINMET': {
+            'provedor': ['PortalINMET'] * 3,
+            'estacao_codigo': ['A820'] * 3,
+            'estacao_nome': ['TOLEDO'] * 3,
+            'entidade': ['INMET'] * 3,
+            'data_hora': ['2024-07-20 1300', '2024-07-20 1400', '2024-07-20 1500'],
+            # O INMET entrega os valores como texto
+            'temperatura_c': ['20.1', '21.0', '85.0'],
+        },
+        'OpenWeatherMap': {
+            'provedor': ['OpenWeatherMap'] * 2,
+            'data_hora': [1721480400, 1721484000],
+            'temperatura_c': [19.5, 20.5],
+        },
+        'WolframAlpha': [
+            {'improvedor': 'WolframAlpha', 'data_consulta': '2024-07-20', 'titulo': 'Weather', 'texto_resultado': '20 °C'},
+        ],
+    }
+
+    main.salvar_dados_consolidados(dados, 'Toledo, Parana')
+
+    arquivos = glob.glob(str(tmp_path / 'dados_climaticos_Toledo_Parana_*.csv'))
+    assert len(arquivos) == 1
+    df = pd.read_csv(arquivos[0], encoding='utf-8-sig').set_index('data_hora_utc')
+    assert df.loc['2024-07-20 13:00:00+00:00', 'temperatura_c_PortalINMET'] == 20.1
+    assert df.loc['2024-07-20 13:00:00+00:00', 'temperatura_c_OpenWeatherMap'] == 19.5
+    # 85 °C está fora da faixa e é descartado pelo controle de qualidade
+    assert pd.isna(df.loc['2024-07-20 15:00:00+00:00', 'temperatura_c_PortalINMET'])
+    assert df.loc['2024-07-20 15:00:00+00:00', 'temperatura_c_PortalINMET_qc'] == 1
+    assert 'estacao_nome_PortalINMET' not in df
+
+
+def test_datas_do_wolfram_nao_esticam_o_periodo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dados = {
+        'OpenWeatherMap': {
+            'provedor': ['OpenWeatherMap'] * 2,
+            'data_hora': [1721480400, 1721484000],
+            'temperatura_c': [19.5, 20.5],
+        },
+        'WolframAlpha': [
+            {'improvedor': 'WolframAlpha', 'data_consulta': '2024-07-15', 'titulo': 'Weather', 'texto_resultado': '18 °C'},
+            {'improvedor': 'WolframAlpha', 'data_consulta': '2024-07-20', 'titulo': 'Weather', 'texto_resultado': '20 °C'},
+        ],
+    }
+
+    main.salvar_dados_consolidados(dados, 'Toledo')
+
+    df = pd.read_csv(glob.glob(str(tmp_path / 'dados_climaticos_Toledo_*.csv'))[0], encoding='utf-8-sig')
+    assert df['data_hora_utc'].tolist() == ['2024-07-20 13:00:00+00:00', '2024-07-20 14:00:00+00:00']
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from normalizacao import NOME_INDICE, coluna_data_hora, normalizar_data_hora
+
+
+def _utc(*valores):
+    return pd.DatetimeIndex(valores, name=NOME_INDICE).tz_localize('UTC').astype('datetime64[ns, UTC]')
+
+
+@pytest.mark.parametrize('provedor, valores', [
+    ('PortalINMET', ['2024-07-20 1300', '2024-07-20 1400']),
+    ('INMET', ['2024-07-20 1300', '2024-07-20 1400']),
+    ('OpenWeatherMap', [1721480400, 1721484000]),
+    ('VisualCrossing', [1721480400, 1721484000]),
+    ('StormGlass', ['2024-07-20T13:00:00+00:00', '2024-07-20T11:00:00-03:00']),
+])
+def test_formatos_declarados_convertem_para_utc(provedor, valores):
+    indice = normalizar_data_hora(pd.Series(valores), provedor)
+
+    pd.testing.assert_index_equal(indice, _utc('2024-07-20 13:00', '2024-07-20 14:00'))
+
+
+def test_data_local_do_wolfram_e_convertida_para_utc():
+    indice = normalizar_data_hora(pd.Series(['2024-07-20']), 'WolframAlpha')
+
+    pd.testing.assert_index_equal(indice, _utc('2024-07-20 03:00'))
+
+
+def test_valores_invalidos_viram_nat():
+    indice = normalizar_data_hora(pd.Series(['2024-07-20 1300', 'None None']), 'PortalINMET')
+
+    assert indice[0] == pd.Timestamp('2024-07-20 13:00', tz='UTC')
+    assert pd.isna(indice[1])
+
+
+def test_unix_ausente_vira_nat():
+    indice = normalizar_data_hora(pd.Series([1721480400, None]), 'OpenWeatherMap')
+
+    assert pd.isna(indice[1])
+
+
+def test_unix_avisa_e_descarta_texto(capsys):
+    indice = normalizar_data_hora(pd.Series([1721480400, '2024-07-20 13:00:00']), 'VisualCrossing')
+
+    assert indice[0] == pd.Timestamp('2024-07-20 13:00', tz='UTC')
+    assert pd.isna(indice[1])
+    assert 'VisualCrossing: 1 valores de data/hora não são timestamps Unix' in capsys.readouterr().out
+
+
+def test_coluna_data_hora():
+    assert coluna_data_hora('WolframAlpha', ['data_consulta', 'titulo']) == 'data_consulta'
+    assert coluna_data_hora('StormGlass', ['temperatura_c']) is None
+    assert coluna_data_hora('Outro', ['data_hora']) == 'data_hora'
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from qualidade import (
+    FLAG_AUSENTE, FLAG_DIVERGENTE, FLAG_FORA_FAIXA, FLAG_PREENCHIDO, FLAG_SALTO,
+    aplicar_controle_qualidade, converter_variaveis_numericas,
+)
+
+
+def _horas(n):
+    return pd.date_range('2024-07-20', periods=n, freq='h', tz='UTC')
+
+
+def test_faixa_e_salto_descartam_valores():
+    df = pd.DataFrame({'temperatura_c_A': [20.0, 21.0, 45.0, 22.0, 99.0, 23.0]}, index=_horas(6))
+
+    resultado = aplicar_controle_qualidade(df)
+
+    assert np.isnan(resultado['temperatura_c_A'].iloc[2])
+    assert np.isnan(resultado['temperatura_c_A'].iloc[4])
+    assert resultado['temperatura_c_A_qc'].tolist() == [0, 0, FLAG_SALTO, 0, FLAG_FORA_FAIXA, 0]
+    # Com um único provedor não há comparação
+    assert 'temperatura_c_divergencia' not in resultado
+
+
+def test_divergencia_com_tres_provedores():
+    df = pd.DataFrame({
+        'temperatura_c_A': [20.0, 20.0, 20.0],
+        'temperatura_c_B': [20.5, 20.5, 20.5],
+        'temperatura_c_C': [21.0, 30.0, 21.0],
+    }, index=_horas(3))
+
+    resultado = aplicar_controle_qualidade(df)
+
+    assert resultado['temperatura_c_C_qc'].tolist() == [0, FLAG_DIVERGENTE, 0]
+    # Valores divergentes são sinalizados, mas mantidos
+    assert resultado['temperatura_c_C'].iloc[1] == 30.0
+    assert resultado['temperatura_c_divergencia'].tolist() == [0.5, 9.5, 0.5]
+
+
+def test_pressao_nao_e_comparada_entre_provedores():
+    df = pd.DataFrame({
+        'pressao_hpa_PortalINMET': [950.0, 951.0],
+        'pressao_hpa_OpenWeatherMap': [1013.0, 1014.0],
+        'pressao_hpa_StormGlass': [1012.0, 1013.0],
+    }, index=_horas(2))
+
+    resultado = aplicar_controle_qualidade(df)
+
+    assert 'pressao_hpa_divergencia' not in resultado
+    assert (resultado['pressao_hpa_PortalINMET_qc'] == 0).all()
+
+
+def test_preenchimento_usa_provedor_corrigido_pelo_vies():
+    df = pd.DataFrame({
+        'umidade_relativa_A': [70.0, 72.0, np.nan, 74.0, 75.0],
+        'umidade_relativa_B': [80.0, 82.0, 83.0, 84.0, 85.0],
+    }, index=_horas(5))
+
+    sem_preencher = aplicar_controle_qualidade(df)
+    preenchido = aplicar_controle_qualidade(df, preencher_lacunas=True)
+
+    assert np.isnan(sem_preencher['umidade_relativa_A'].iloc[2])
+    assert preenchido['umidade_relativa_A'].iloc[2] == 73.0
+    assert preenchido['umidade_relativa_A_qc'].iloc[2] == FLAG_PREENCHIDO
+
+
+def test_valor_ausente_tem_sinalizacao_propria():
+    df = pd.DataFrame({
+        'temperatura_c_A': [20.0, np.nan, 21.0],
+        'temperatura_c_B': [20.5, 20.5, np.nan],
+    }, index=_horas(3))
+
+    resultado = aplicar_controle_qualidade(df)
+
+    assert resultado['temperatura_c_A_qc'].tolist() == [0, FLAG_AUSENTE, 0]
+    assert resultado['temperatura_c_B_qc'].tolist() == [0, 0, FLAG_AUSENTE]
+
+
+def test_converter_variaveis_numericas():
+    df = pd.DataFrame({'temperatura_c': ['20.5', None, 'x'], 'estacao_nome': ['A', 'A', 'A']})
+
+    df = converter_variaveis_numericas(df)
+
+    assert df['temperatura_c'].iloc[0] == 20.5
+    assert df['temperatura_c'].isna().tolist() == [False, True, True]
+    assert df['estacao_nome'].tolist() == ['A', 'A', 'A']